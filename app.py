@@ -1,8 +1,21 @@
 import streamlit as st
 import pandas as pd
 import ast
+import math
+import os
+import re
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import sparse
 import plotly.express as px
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # --- 1. CONFIGURATION ---
 st.set_page_config(
     page_title="Millennium Talent Scout",
@@ -39,12 +52,14 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 2. DATA LOADING & CLEANING ---
+DATA_PATH = "Milennium Case Study Output.csv"
+CACHE_PATH = "Milennium Case Study Output.cleaned.parquet"
+PAGE_SIZE = 50
+AST_ONLY_TOKENS = re.compile(r'\b(?:true|false|null)\b|\d{19,}')
+
 @st.cache_data
 def load_and_clean_data():
     try:
-        df = pd.read_csv("Milennium Case Study Output.csv")
-        df.columns = [c.strip() for c in df.columns]
-        
         col_map = {
             'name': 'Name',
             'email': 'Email',
@@ -59,32 +74,59 @@ def load_and_clean_data():
             'internship_history': 'Internship History'
         }
         
-        def parse_field(x):
-            if pd.isna(x) or x == "" or str(x).lower() in ["nan", "none"]:
-                return []
+        def parse_list_column(series):
+            s = series.astype('string').str.strip()
+            lowered = s.str.lower()
+            
+            # Missing / Empty
+            is_null = (s.isna() | lowered.isin(['nan', 'none', ''])).fillna(True)
             
-            x_str = str(x).strip()
+            # Python List Format (only these rows are parsed as literals)
+            def eval_list(x_str):
+                parsed = None
+                # Without double quotes or escapes, swapping quote style makes
+                # the literal valid JSON, which orjson parses far faster.
+                # JSON-only tokens (true/false/null), which literal_eval rejects,
+                # and digit runs past 64-bit range, which orjson turns into
+                # floats, are left to literal_eval so results match it
+                if ('"' not in x_str and '\\' not in x_str
+                        and not AST_ONLY_TOKENS.search(x_str)):
+                    try:
+                        parsed = orjson.loads(x_str.replace("'", '"'))
+                    except orjson.JSONDecodeError:
+                        pass
+                if parsed is None:
+                    try:
+                        parsed = ast.literal_eval(x_str)
+                    except (ValueError, SyntaxError, TypeError):
+                        return None
+                if not isinstance(parsed, list):
+                    return None
+                clean_list = []
+                for i in parsed:
+                    item = str(i).strip()
+                    if item.lower() not in ['none', 'n/a', 'nan', '']:
+                        clean_list.append(item)
+                return clean_list
             
-            # Python List Format
-            if x_str.startswith('[') and x_str.endswith(']'):
-                try:
-                    parsed = ast.literal_eval(x_str)
-                    if isinstance(parsed, list):
-                        clean_list = []
-                        for i in parsed:
-                            item = str(i).strip()
-                            if item.lower() not in ['none', 'n/a', 'nan', '']:
-                                clean_list.append(item)
-                        return clean_list
-                except:
-                    pass
+            is_listlit = ~is_null & s.str.startswith('[').fillna(False) & s.str.endswith(']').fillna(False)
+            listlit = s[is_listlit].astype(object).map(eval_list).dropna()
+            remaining = ~is_null & ~s.index.isin(listlit.index)
             
             # Comma Separated Format
-            if ',' in x_str:
-                return [i.strip() for i in x_str.split(',') if i.strip().lower() not in ['none', 'n/a']]
+            is_csv = remaining & s.str.contains(',', regex=False).fillna(False)
+            csv = s[is_csv].str.split(',').map(
+                lambda lst: [i.strip() for i in lst if i.strip().lower() not in ['none', 'n/a']]
+            )
             
             # Single Item
-            return [x_str] if x_str.lower() not in ['none', 'n/a'] else []
+            is_single = remaining & ~is_csv
+            single = s[is_single].astype(object).map(
+                lambda v: [v] if v.lower() not in ['none', 'n/a'] else []
+            )
+            
+            empty = pd.Series([[] for _ in range(int(is_null.sum()))], index=s.index[is_null], dtype=object)
+            return pd.concat([listlit, csv, single, empty]).reindex(s.index)
 
         list_cols = [
             col_map['geography'], 
@@ -94,22 +136,159 @@ def load_and_clean_data():
             col_map['internship_history']
         ]
         
+        # Reuse the cleaned Parquet copy while it is newer than both the CSV
+        # and this script (cleaning changes alter the cached schema)
+        source_mtime = max(os.path.getmtime(DATA_PATH), os.path.getmtime(__file__))
+        if os.path.exists(CACHE_PATH) and os.path.getmtime(CACHE_PATH) >= source_mtime:
+            try:
+                table = pq.read_table(CACHE_PATH)
+            except (OSError, pa.ArrowException):
+                # Unreadable cache: fall through and rebuild it from the CSV
+                table = None
+            if table is not None:
+                df = table.to_pandas()
+                for col in list_cols:
+                    if col in df.columns:
+                        df[col] = table.column(col).to_pylist()
+                return df, col_map, source_mtime
+        
+        # Arrow's multithreaded CSV reader; same NA handling as the C engine
+        df = pd.read_csv(DATA_PATH, engine="pyarrow")
+        df.columns = [c.strip() for c in df.columns]
+        
         for col in list_cols:
             if col in df.columns:
-                df[col] = df[col].apply(parse_field)
+                df[col] = parse_list_column(df[col])
+        
+        # Comma-joined copies of the list columns shown in the candidate table
+        for col in [col_map['geography'], col_map['sectors']]:
+            if col in df.columns:
+                df[f"{col}_str"] = df[col].str.join(', ')
         
-        df[col_map['experience']] = pd.to_numeric(df[col_map['experience']], errors='coerce').fillna(0)
-        df[col_map['name']] = df[col_map['name']].fillna("Unknown Candidate")
-        df[col_map['strategy']] = df[col_map['strategy']].fillna("Unclassified")
-        df[col_map['rationale_strategy']] = df[col_map['rationale_strategy']].fillna("No rationale provided.")
+        df[col_map['experience']] = pd.to_numeric(df[col_map['experience']], errors='coerce')
+        df.fillna({
+            col_map['name']: "Unknown Candidate",
+            col_map['email']: "Not Provided",
+            col_map['strategy']: "Unclassified",
+            col_map['experience']: 0,
+            col_map['rationale_strategy']: "No rationale provided."
+        }, inplace=True)
         
-        return df, col_map
+        # Compact dtypes for the columns every filter and metric touches
+        experience = df[col_map['experience']]
+        downcast = 'integer' if (experience % 1 == 0).all() else 'float'
+        df[col_map['experience']] = pd.to_numeric(experience, downcast=downcast)
+        df[col_map['strategy']] = df[col_map['strategy']].astype('category')
+        
+        # Write beside the target and swap it in, so an interrupted or failed
+        # write never leaves a truncated cache behind
+        tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, CACHE_PATH)
+        except (OSError, pa.ArrowException):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        return df, col_map, source_mtime
         
     except FileNotFoundError:
-        st.error("Error: 'output.csv' not found.")
-        return pd.DataFrame(), {}
+        st.error(f"Error: '{DATA_PATH}' not found.")
+        return pd.DataFrame(), {}, None
+
+# Candidate x tag incidence matrices are built once per dataset.
+# st.cache_data hands back a fresh copy of df on every rerun, so derived
+# structures are keyed on the data version returned by the loader (newest
+# mtime of the CSV and this script) rather than id(df).
+@st.cache_resource
+def tag_matrix(_df, data_version, col):
+    # Keys stay in sorted order and double as the multiselect options
+    tags = sorted({t for lst in _df[col] for t in lst})
+    tag_index = {tag: i for i, tag in enumerate(tags)}
+    rows = [r for r, lst in enumerate(_df[col]) for _ in lst]
+    cols_idx = [tag_index[t] for lst in _df[col] for t in lst]
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols_idx)),
+        shape=(len(_df), len(tags))
+    )
+    return matrix, tag_index
+
+def tag_mask(matrix, tag_index, selected):
+    sel_vec = np.zeros(len(tag_index), dtype=np.int32)
+    sel_vec[[tag_index[t] for t in selected if t in tag_index]] = 1
+    if njit is not None:
+        return rows_with_any_tag(matrix.indptr, matrix.indices, sel_vec.astype(np.bool_))
+    return (matrix @ sel_vec) > 0
+
+# Compiled row scan over the CSR buffers that stops at the first matching
+# tag. Kept serial: the parallel threading layer deadlocks when launched from
+# Streamlit's script threads. Falls back to the sparse product above when
+# numba is not installed.
+if njit is not None:
+    @njit(cache=True)
+    def rows_with_any_tag(indptr, indices, selected):
+        n = indptr.shape[0] - 1
+        out = np.zeros(n, dtype=np.bool_)
+        for r in range(n):
+            for k in range(indptr[r], indptr[r + 1]):
+                if selected[indices[k]]:
+                    out[r] = True
+                    break
+        return out
+
+# Per-tag totals over the selected rows, straight from the CSR buffers
+def tag_counts(matrix, tag_index, row_mask, label):
+    keep = np.repeat(row_mask, np.diff(matrix.indptr))
+    counts = np.bincount(
+        matrix.indices[keep], weights=matrix.data[keep], minlength=len(tag_index)
+    ).astype(np.int64)
+    counts_df = pd.DataFrame({label: list(tag_index), 'Count': counts})
+    counts_df = counts_df[counts_df['Count'] > 0]
+    return counts_df.sort_values('Count', ascending=False, kind='stable').reset_index(drop=True)
+
+# Filter results and chart aggregates are memoized on the widget state, so
+# returning to an earlier filter combination skips the whole pipeline
+@st.cache_data(max_entries=64)
+def compute_view(_df, _cols, data_version, selected_strategies, selected_geos, selected_sectors, exp_lo, exp_hi):
+    # Each filter narrows one boolean mask over the column buffers
+    row_mask = np.ones(len(_df), dtype=bool)
+    exp_arr = _df[_cols['experience']].to_numpy()
+    strategy_codes = _df[_cols['strategy']].cat.codes.to_numpy()
+    categories = _df[_cols['strategy']].cat.categories
+
+    # Filter: Strategy (Only apply if user selected something)
+    if selected_strategies:
+        sel_codes = [categories.get_loc(s) for s in selected_strategies if s in categories]
+        row_mask &= np.isin(strategy_codes, sel_codes)
+
+    # Filter: Experience (Always applies)
+    row_mask &= (exp_arr >= exp_lo) & (exp_arr <= exp_hi)
+
+    # Filter: Geography (Only apply if user selected something)
+    if selected_geos:
+        row_mask &= tag_mask(*tag_matrix(_df, data_version, _cols['geography']), selected_geos)
+
+    # Filter: Sector (Only apply if user selected something)
+    if selected_sectors:
+        row_mask &= tag_mask(*tag_matrix(_df, data_version, _cols['sectors']), selected_sectors)
 
-df, cols = load_and_clean_data()
+    match_count = int(row_mask.sum())
+    if not match_count:
+        return row_mask, None, None, (0, 0, 0)
+
+    # Metrics reuse the mask and buffers above instead of rescanning a frame
+    avg_yrs = round(float(exp_arr[row_mask].mean()), 1)
+    if 'Quantitative' in categories:
+        quant_count = int((row_mask & (strategy_codes == categories.get_loc('Quantitative'))).sum())
+    else:
+        quant_count = 0
+
+    sector_counts = tag_counts(*tag_matrix(_df, data_version, _cols['sectors']), row_mask, 'Sector')
+    geo_counts = tag_counts(*tag_matrix(_df, data_version, _cols['geography']), row_mask, 'Region')
+
+    return row_mask, sector_counts, geo_counts, (match_count, avg_yrs, quant_count)
+
+df, cols, data_version = load_and_clean_data()
 
 if df.empty:
     st.stop()
@@ -120,21 +299,23 @@ with st.sidebar:
     
     # 1. Geographic Markets (Default Empty)
     if cols['geography'] in df.columns:
-        all_geos = sorted(list(set([item for sublist in df[cols['geography']] for item in sublist])))
+        _, geo_index = tag_matrix(df, data_version, cols['geography'])
+        all_geos = list(geo_index)
         selected_geos = st.multiselect("Geographic Markets", all_geos, default=[]) 
     else:
         selected_geos = []
 
     # 2. Sectors (Default Empty)
     if cols['sectors'] in df.columns:
-        all_sectors = sorted(list(set([item for sublist in df[cols['sectors']] for item in sublist])))
+        _, sector_index = tag_matrix(df, data_version, cols['sectors'])
+        all_sectors = list(sector_index)
         selected_sectors = st.multiselect("Sectors", all_sectors, default=[])
     else:
         selected_sectors = []
 
     # 3. Investment Approach (Default Empty)
     if cols['strategy'] in df.columns:
-        strategies = sorted(df[cols['strategy']].astype(str).unique().tolist())
+        strategies = df[cols['strategy']].cat.categories.sort_values().tolist()
         selected_strategies = st.multiselect("Investment Approach", strategies, default=[])
     else:
         selected_strategies = []
@@ -149,44 +330,20 @@ with st.sidebar:
         exp_range = (0, 20)
 
 # --- 4. FILTERING LOGIC ---
-filtered_df = df.copy()
-
-# Filter: Strategy (Only apply if user selected something)
-if selected_strategies:
-    filtered_df = filtered_df[filtered_df[cols['strategy']].isin(selected_strategies)]
-
-# Filter: Experience (Always applies)
-if cols['experience'] in df.columns:
-    filtered_df = filtered_df[
-        (filtered_df[cols['experience']] >= exp_range[0]) & 
-        (filtered_df[cols['experience']] <= exp_range[1])
-    ]
-
-# Filter: Geography (Only apply if user selected something)
-if selected_geos:
-    filtered_df = filtered_df[filtered_df[cols['geography']].apply(
-        lambda x: bool(set(x) & set(selected_geos))
-    )]
-
-# Filter: Sector (Only apply if user selected something)
-if selected_sectors:
-    filtered_df = filtered_df[filtered_df[cols['sectors']].apply(
-        lambda x: bool(set(x) & set(selected_sectors))
-    )]
+row_mask, sector_counts, geo_counts, (match_count, avg_yrs, quant_count) = compute_view(
+    df, cols, data_version,
+    tuple(sorted(selected_strategies)),
+    tuple(sorted(selected_geos)),
+    tuple(sorted(selected_sectors)),
+    exp_range[0], exp_range[1]
+)
+filtered_df = df.iloc[row_mask]
 
 # --- 5. DASHBOARD MAIN AREA ---
 st.markdown('<p class="main-header">Millennium Talent Platform</p>', unsafe_allow_html=True)
 
 c1, c2, c3 = st.columns(3)
-c1.metric("Candidates Found", len(filtered_df))
-
-if not filtered_df.empty:
-    avg_yrs = round(filtered_df[cols['experience']].mean(), 1)
-    quant_count = len(filtered_df[filtered_df[cols['strategy']] == 'Quantitative'])
-else:
-    avg_yrs = 0
-    quant_count = 0
-
+c1.metric("Candidates Found", match_count)
 c2.metric("Avg. Experience", f"{avg_yrs} Yrs")
 c3.metric("Quant Profiles", quant_count)
 
@@ -196,14 +353,10 @@ if not filtered_df.empty:
     tab1, tab2 = st.tabs(["📊 Sector Distribution", "🌍 Geographic Presence"])
     
     with tab1:
-        sector_counts = filtered_df.explode(cols['sectors'])[cols['sectors']].value_counts().reset_index()
-        sector_counts.columns = ['Sector', 'Count']
         fig_sec = px.bar(sector_counts.head(10), x='Count', y='Sector', orientation='h', title="Top Sectors", color='Count')
         st.plotly_chart(fig_sec, use_container_width=True)
 
     with tab2:
-        geo_counts = filtered_df.explode(cols['geography'])[cols['geography']].value_counts().reset_index()
-        geo_counts.columns = ['Region', 'Count']
         fig_geo = px.bar(geo_counts, x='Region', y='Count', title="Geographic Focus", color='Region')
         st.plotly_chart(fig_geo, use_container_width=True)
 
@@ -211,7 +364,45 @@ if not filtered_df.empty:
 st.subheader("📋 Candidate Profiles")
 
 if not filtered_df.empty:
-    for _, row in filtered_df.iterrows():
+    table_cols = [
+        c for c in [
+            cols['name'], cols['strategy'], cols['experience'], cols['email'],
+            cols['phone'], f"{cols['geography']}_str", f"{cols['sectors']}_str"
+        ] if c in filtered_df.columns
+    ]
+    # Only the current page is sent to the browser
+    page_count = max(1, math.ceil(len(filtered_df) / PAGE_SIZE))
+    if st.session_state.get('page', 1) > page_count:
+        st.session_state['page'] = page_count
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, key='page')
+    else:
+        page = 1
+    page_df = filtered_df.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+    st.caption(f"Showing {(page - 1) * PAGE_SIZE + 1}-{(page - 1) * PAGE_SIZE + len(page_df)} of {len(filtered_df)}")
+
+    event = st.dataframe(
+        page_df[table_cols],
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        column_config={
+            cols['name']: "Name",
+            cols['strategy']: "Investment Approach",
+            cols['experience']: st.column_config.NumberColumn("Years Exp"),
+            cols['email']: "Email",
+            cols['phone']: "Phone",
+            f"{cols['geography']}_str": "Geographic Markets",
+            f"{cols['sectors']}_str": "Sectors",
+        }
+    )
+
+    # Full profile only for the selected candidate (positions may be stale
+    # after the filters or page change)
+    selected_rows = [r for r in event.selection.rows if r < len(page_df)]
+    if selected_rows:
+        row = page_df.iloc[selected_rows[0]]
         name = row[cols['name']]
         strategy = row[cols['strategy']]
         exp = row[cols['experience']]
@@ -219,7 +410,8 @@ if not filtered_df.empty:
         phone = row.get(cols['phone'], 'N/A')
         rationale = row.get(cols['rationale_strategy'], 'No rationale provided.')
         
-        with st.expander(f"**{name}** | {strategy} | {exp} Years Exp"):
+        with st.container(border=True):
+            st.markdown(f"### {name} | {strategy} | {exp} Years Exp")
             col_left, col_right = st.columns([1, 2])
             
             with col_left:
@@ -254,6 +446,8 @@ if not filtered_df.empty:
                     st.markdown("#### 🎓 Internship History")
                     for item in intern_items:
                         st.markdown(f'<div class="intern-item">{item}</div>', unsafe_allow_html=True)
+    else:
+        st.caption("Select a candidate in the table to view their full profile.")
 
 else:
     st.warning("No candidates match the selected filters.")
\ No newline at end of file